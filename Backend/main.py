@@ -9,29 +9,30 @@ Endpoints
 - POST /move/bot       : ask the bot to choose and apply a move (minimax+AB)
 - POST /reset          : reset the game state
 
-Board representation: 10x10 list of lists containing player ids or null.
+Board representation: the game state keeps a flat bytearray of player codes
+(row-major, see CODES); responses carry it as a 10x10 list of lists containing
+player ids or null.
 """
 from __future__ import annotations
 
-import sys
-from pathlib import Path
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel, Field, validator
 
-# Ensure the Robot package is importable when running from Backend/
-ROOT = Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-  sys.path.append(str(ROOT))
-
-from Robot import TurnState, choose_best_move, find_drop_row  # type: ignore
-from Robot import check_win, roll_next_turn  # type: ignore
-from Robot.robot_brain import MAX_DEPTH  # type: ignore
+# The Robot package is installed from the repository root (`pip install -e .`).
+from Robot import TurnState, choose_best_move_cells
+from Robot import check_win_cells, roll_next_turn
+from Robot.robot_brain import MAX_DEPTH
 
 ROWS = 10
 COLS = 10
-PLAYERS: List[str] = ["P1", "P2", "BOT"]
+PLAYERS: Tuple[str, ...] = ("P1", "P2", "BOT")
+HUMANS: List[str] = [p for p in PLAYERS if p != "BOT"]
+# Cell codes for the flat board; IDS[code] maps back to the player id.
+IDS: List[Optional[str]] = [None, "P1", "P2", "BOT"]
+CODES: Dict[Optional[str], int] = {pid: code for code, pid in enumerate(IDS)}
+HUMAN_CODES: List[int] = [CODES[p] for p in HUMANS]
 
 app = FastAPI(title="Connect 4 (10x10) Backend", version="0.1.0")
 
@@ -50,6 +51,18 @@ if CORSMiddleware:
     allow_headers=["*"],
   )
 
+# orjson is optional; stdlib json is the fallback for the cached /state body.
+try:
+  import orjson
+
+  def _dumps(obj) -> bytes:
+    return orjson.dumps(obj)
+except ImportError:
+  import json
+
+  def _dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode()
+
 
 # ----------------------------
 # Pydantic models
@@ -99,35 +112,57 @@ class MoveResponse(BaseModel):
 # ----------------------------
 # Game state
 # ----------------------------
-def _new_board() -> List[List[Optional[str]]]:
-  return [[None for _ in range(COLS)] for _ in range(ROWS)]
+def _new_board() -> bytearray:
+  return bytearray(ROWS * COLS)
+
+
+def _flat_to_grid(flat: bytearray) -> List[List[Optional[str]]]:
+  return [[IDS[code] for code in flat[r * COLS:(r + 1) * COLS]] for r in range(ROWS)]
+
+
+def _new_heights() -> List[int]:
+  """Next free row per column; -1 once the column is full."""
+  return [ROWS - 1] * COLS
 
 
 state = {
   "board": _new_board(),
+  "heights": _new_heights(),
   "winner": None,
   "last_move": None,
   "history": [],  # list of dicts: {player,row,col}
   "turn_state": TurnState(),
+  "_state_json": None,  # cached GET /state body; cleared whenever the game changes
+  "_grid": None,  # cached _flat_to_grid(board); cleared alongside _state_json
 }
 
 
 # ----------------------------
 # Helpers
 # ----------------------------
+def _board_grid() -> List[List[Optional[str]]]:
+  """The board as id lists, built at most once per game change."""
+  if state["_grid"] is None:
+    state["_grid"] = _flat_to_grid(state["board"])
+  return state["_grid"]
+
+
 def _apply_move(player_id: str, column: int) -> tuple[int, int]:
   if state["winner"]:
     raise HTTPException(status_code=400, detail=f"Game over. Winner: {state['winner']}")
 
-  drop_row = find_drop_row(state["board"], column)
-  if drop_row is None:
+  drop_row = state["heights"][column]
+  if drop_row < 0:
     raise HTTPException(status_code=400, detail="Column is full.")
 
-  state["board"][drop_row][column] = player_id
+  state["board"][drop_row * COLS + column] = CODES[player_id]
+  state["heights"][column] = drop_row - 1
   state["last_move"] = {"player": player_id, "row": drop_row, "col": column}
   state["history"].append(state["last_move"])
+  state["_state_json"] = None
+  state["_grid"] = None
 
-  if check_win(state["board"], drop_row, column):
+  if check_win_cells(state["board"], drop_row, column):
     state["winner"] = player_id
 
   return drop_row, column
@@ -138,12 +173,15 @@ def _apply_move(player_id: str, column: int) -> tuple[int, int]:
 # ----------------------------
 @app.get("/state", response_model=StateResponse)
 def get_state():
-  return {
-    "board": state["board"],
-    "winner": state["winner"],
-    "last_move": state["last_move"],
-    "history": state["history"][-50:],
-  }
+  # Serialized once per game change; polling GETs reuse the same bytes.
+  if state["_state_json"] is None:
+    state["_state_json"] = _dumps({
+      "board": _board_grid(),
+      "winner": state["winner"],
+      "last_move": state["last_move"],
+      "history": state["history"][-50:],
+    })
+  return Response(content=state["_state_json"], media_type="application/json")
 
 
 @app.post("/dice/roll", response_model=DiceResponse)
@@ -162,7 +200,7 @@ def human_move(body: HumanMoveRequest):
   return {
     "row": row,
     "column": col,
-    "board": state["board"],
+    "board": _board_grid(),
     "winner": state["winner"],
     "history": state["history"][-50:],
     "bot_stats": None,
@@ -176,7 +214,7 @@ def bot_move(body: BotMoveRequest):
 
   depth = body.depth or MAX_DEPTH
   try:
-    result = choose_best_move(state["board"], bot_id="BOT", depth=depth)
+    result = choose_best_move_cells(state["board"], CODES["BOT"], HUMAN_CODES, depth=depth)
   except ValueError as exc:
     raise HTTPException(status_code=400, detail=str(exc))
 
@@ -184,7 +222,7 @@ def bot_move(body: BotMoveRequest):
   return {
     "row": applied_row,
     "column": applied_col,
-    "board": state["board"],
+    "board": _board_grid(),
     "winner": state["winner"],
     "history": state["history"][-50:],
     "bot_stats": {
@@ -199,10 +237,13 @@ def bot_move(body: BotMoveRequest):
 @app.post("/reset")
 def reset():
   state["board"] = _new_board()
+  state["heights"] = _new_heights()
   state["winner"] = None
   state["last_move"] = None
   state["history"] = []
   state["turn_state"] = TurnState()
+  state["_state_json"] = None
+  state["_grid"] = None
   return {"ok": True}
 
 
@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
 
 
 @dataclass
@@ -24,13 +25,10 @@ def roll_next_turn(players: Sequence[str], state: TurnState, *, rnd: Optional[ra
   if not players:
     raise ValueError("At least one player is required.")
 
-  rnd = rnd or random
-  pool: List[str] = [p for p in players if p != state.skip_next]
-  if not pool:
-    # Fallback: everyone was excluded (e.g., only one player) — allow all.
-    pool = list(players)
-
-  chosen = rnd.choice(pool)
+  choice = (rnd or random).choice
+  players = tuple(players)
+  pools = _pools_without(players)
+  chosen = choice(pools.get(state.skip_next, players))
 
   # Clear the skip after it has been applied once.
   if state.skip_next is not None:
@@ -48,13 +46,22 @@ def roll_next_turn(players: Sequence[str], state: TurnState, *, rnd: Optional[ra
     state.consecutive_count = 0
     forced_skip = True
 
-  next_pool = [p for p in players if p != state.skip_next] if state.skip_next else list(players)
   return {
     "player": chosen,
     "skip_next": state.skip_next,
     "forced_skip": forced_skip,
-    "next_roll_pool": next_pool,
+    "next_roll_pool": pools.get(state.skip_next, players),
   }
 
 
+@lru_cache(maxsize=32)
+def _pools_without(players: Tuple[str, ...]) -> Dict[Optional[str], Tuple[str, ...]]:
+  """Roll pool for every possible `skip_next`, built once per player tuple."""
+  pools: Dict[Optional[str], Tuple[str, ...]] = {None: players}
+  for skipped in players:
+    # Fallback: everyone was excluded (e.g., only one player) — allow all.
+    pools[skipped] = tuple(p for p in players if p != skipped) or players
+  return pools
+
+
 __all__ = ["TurnState", "roll_next_turn"]
@@ -1,7 +1,11 @@
 from .robot_brain import (
   SearchResult,
   choose_best_move,
+  choose_best_move_cells,
   check_win,
+  check_win_cells,
+  encode_board,
+  encode_cells,
   evaluate_board,
   find_drop_row,
   infer_opponents,
@@ -11,7 +15,11 @@ from .DiceTurn import TurnState, roll_next_turn
 __all__ = [
   "SearchResult",
   "choose_best_move",
+  "choose_best_move_cells",
   "check_win",
+  "check_win_cells",
+  "encode_board",
+  "encode_cells",
   "evaluate_board",
   "find_drop_row",
   "infer_opponents",
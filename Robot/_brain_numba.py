@@ -0,0 +1,341 @@
+"""
+Optional Numba-compiled alpha-beta kernel for `robot_brain`.
+
+The pure-Python search keeps one 110-bit bitboard per player, which does not
+fit a machine word, so this kernel works on a flat int8 grid instead
+(`cells[row * COLS + col]`, 0 = empty, `slot + 1` for each player slot and
+`n_players + 1` for ids outside the search) plus an int8 `heights` array
+holding the next free row of every column. It mirrors `robot_brain.minimax`,
+including the transposition table, which lives in fixed-size arrays indexed
+by `key & TT_MASK` (replace-always). Columns and scores match the Python
+search; node counts match only while the table sees few collisions (up to
+depth 4 or so), since replaced entries get searched again.
+
+`AVAILABLE` is False when numba is not installed; callers then stay on the
+pure-Python search.
+"""
+from __future__ import annotations
+
+from .robot_brain import (
+  _WINDOW_TABLE,
+  CENTER_WEIGHT,
+  COL_ORDER,
+  COLS,
+  CONNECT_N,
+  NULL_MOVE_MIN_DEPTH,
+  NULL_MOVE_R,
+  ROWS,
+  WIN_SCORE,
+  WINDOW_CELLS,
+)
+
+try:
+  import numpy as np
+  from numba import njit
+except ImportError:
+  AVAILABLE = False
+else:
+  AVAILABLE = True
+
+MAX_CODES = 8  # empty + bot + up to six other slots
+TT_BITS = 18
+TT_MASK = (1 << TT_BITS) - 1
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+
+if AVAILABLE:
+  _rng = np.random.default_rng(0x0C04)
+  _ZOBRIST = _rng.integers(1, 1 << 62, size=(MAX_CODES, ROWS * COLS), dtype=np.int64)
+  _SIDE_KEY = int(_rng.integers(1, 1 << 62))
+
+  _DIRS = np.array([(0, 1), (1, 0), (1, 1), (-1, 1)], dtype=np.int64)
+  _ORDER = np.array(COL_ORDER, dtype=np.int64)
+  _SCORE_TBL = np.array(_WINDOW_TABLE, dtype=np.float64)
+  _WINDOWS = np.array(
+    [[cells[i] * COLS + cells[i + 1] for i in range(0, len(cells), 2)] for cells in WINDOW_CELLS],
+    dtype=np.int64,
+  )
+  # Rows of _WINDOWS covering each cell, padded with -1.
+  _CELL_WINDOWS = np.full((ROWS * COLS, 4 * CONNECT_N), -1, dtype=np.int64)
+  for _w, _cells in enumerate(_WINDOWS):
+    for _idx in _cells:
+      _CELL_WINDOWS[_idx, np.argmax(_CELL_WINDOWS[_idx] < 0)] = _w
+  del _w, _cells, _idx
+
+  @njit(cache=True)
+  def _check_win(cells, idx):
+    code = cells[idx]
+    row = idx // COLS
+    col = idx % COLS
+    for d in range(4):
+      dr = _DIRS[d, 0]
+      dc = _DIRS[d, 1]
+      count = 1
+      r = row + dr
+      c = col + dc
+      while 0 <= r < ROWS and 0 <= c < COLS and cells[r * COLS + c] == code:
+        count += 1
+        r += dr
+        c += dc
+      r = row - dr
+      c = col - dc
+      while 0 <= r < ROWS and 0 <= c < COLS and cells[r * COLS + c] == code:
+        count += 1
+        r -= dr
+        c -= dc
+      if count >= CONNECT_N:
+        return True
+    return False
+
+  @njit(cache=True)
+  def _order_moves(heights, tt_col, killer, history, order):
+    """Fill `order` like `robot_brain.order_moves`; returns the number of legal columns."""
+    n = 0
+    if tt_col >= 0 and heights[tt_col] >= 0:
+      order[n] = tt_col
+      n += 1
+    if killer >= 0 and killer != tt_col and heights[killer] >= 0:
+      order[n] = killer
+      n += 1
+    front = n
+    for i in range(COLS):
+      col = _ORDER[i]
+      if heights[col] < 0 or col == tt_col or col == killer:
+        continue
+      j = n  # stable insertion by descending history
+      while j > front and history[order[j - 1]] < history[col]:
+        order[j] = order[j - 1]
+        j -= 1
+      order[j] = col
+      n += 1
+    return n
+
+  @njit(cache=True)
+  def _window_index(cells, w, other):
+    """`_SCORE_TBL` index of window `w`, or -1 when it holds an `other` disc (scores 0)."""
+    bot = 0
+    opp = 0
+    for k in range(CONNECT_N):
+      v = cells[_WINDOWS[w, k]]
+      if v == 1:
+        bot += 1
+      elif v == other:
+        return -1
+      elif v > 1:
+        opp += 1
+    return bot * (CONNECT_N + 1) + opp
+
+  @njit(cache=True)
+  def _move_delta(cells, idx, is_bot, other):
+    """Change in `_evaluate(cells, other)` once empty cell `idx` takes a bot (or opponent) disc."""
+    step = CONNECT_N + 1 if is_bot else 1
+    delta = 0.0
+    if is_bot and idx % COLS == COLS // 2:
+      delta += CENTER_WEIGHT
+    for j in range(_CELL_WINDOWS.shape[1]):
+      w = _CELL_WINDOWS[idx, j]
+      if w < 0:
+        break
+      t = _window_index(cells, w, other)
+      if t >= 0:
+        delta += _SCORE_TBL[t + step] - _SCORE_TBL[t]
+    return delta
+
+  @njit(cache=True)
+  def _has_open_three(cells, other):
+    for w in range(_WINDOWS.shape[0]):
+      t = _window_index(cells, w, other)
+      if t < 0:
+        continue
+      bot, opp = divmod(t, CONNECT_N + 1)
+      if bot + opp == CONNECT_N - 1 and (bot == 0 or opp == 0):
+        return True
+    return False
+
+  @njit(cache=True)
+  def _evaluate(cells, other):
+    """Mirrors `robot_brain.evaluate_bits`; `other` is the code of discs outside the search."""
+    score = 0.0
+    for r in range(ROWS):
+      if cells[r * COLS + COLS // 2] == 1:
+        score += CENTER_WEIGHT
+    for w in range(_WINDOWS.shape[0]):
+      t = _window_index(cells, w, other)
+      if t >= 0:
+        score += _SCORE_TBL[t]
+    return score
+
+  # Not cached: numba cannot reliably reload recursive functions (or their
+  # callers) from the on-disk cache, so these compile once per process in
+  # `_warm_up` instead.
+  @njit
+  def _minimax(cells, heights, depth, maximizing, n_opp, alpha, beta, last_idx, key,
+               tt_keys, tt_vals, tt_meta, killers, history, static, nodes):
+    nodes[0] += 1
+
+    if last_idx >= 0 and _check_win(cells, last_idx):
+      if cells[last_idx] == 1:
+        return WIN_SCORE + depth  # prefer faster wins
+      return -WIN_SCORE - depth   # prefer slower losses
+
+    any_free = False
+    for c in range(COLS):
+      if heights[c] >= 0:
+        any_free = True
+        break
+    if depth == 0 or not any_free:
+      return static
+
+    tt_key = key if maximizing else key ^ _SIDE_KEY
+    slot = tt_key & TT_MASK
+    hint = -1
+    if tt_keys[slot] == tt_key:
+      hint = tt_meta[slot, 2]
+      if tt_meta[slot, 0] >= depth:
+        stored = tt_vals[slot]
+        flag = tt_meta[slot, 1]
+        if flag == TT_EXACT:
+          return stored
+        if flag == TT_LOWER:
+          alpha = max(alpha, stored)
+        else:
+          beta = min(beta, stored)
+        if alpha >= beta:
+          return stored
+
+    # Null move, as in robot_brain.minimax.
+    if maximizing and depth >= NULL_MOVE_MIN_DEPTH and beta < np.inf and not _has_open_three(cells, n_opp + 2):
+      null_score = _minimax(cells, heights, depth - 1 - NULL_MOVE_R, False, n_opp, beta - 1, beta, -1, key,
+                            tt_keys, tt_vals, tt_meta, killers, history, static, nodes)
+      if null_score >= beta:
+        return null_score
+
+    order = np.empty(COLS, dtype=np.int64)
+    n_moves = _order_moves(heights, hint, killers[depth], history, order)
+    alpha_orig = alpha
+    beta_orig = beta
+    best_col = -1
+
+    if maximizing:
+      value = -np.inf
+      for i in range(n_moves):
+        col = order[i]
+        row = heights[col]
+        idx = row * COLS + col
+        child_static = static + _move_delta(cells, idx, True, n_opp + 2)
+        cells[idx] = 1
+        heights[col] = row - 1
+        score = _minimax(cells, heights, depth - 1, False, n_opp, alpha, beta, idx, key ^ _ZOBRIST[1, idx],
+                         tt_keys, tt_vals, tt_meta, killers, history, child_static, nodes)
+        cells[idx] = 0
+        heights[col] = row
+        if score > value:
+          value = score
+          best_col = col
+        alpha = max(alpha, value)
+        if alpha >= beta:
+          killers[depth] = col
+          history[col] += depth * depth
+          break
+    else:
+      # Minimizing layer: explore every human id and take the worst outcome for the bot.
+      value = np.inf
+      for i in range(n_moves):
+        col = order[i]
+        row = heights[col]
+        idx = row * COLS + col
+        child_static = static + _move_delta(cells, idx, False, n_opp + 2)
+        heights[col] = row - 1
+        for code in range(2, n_opp + 2):
+          cells[idx] = code
+          score = _minimax(cells, heights, depth - 1, True, n_opp, alpha, beta, idx, key ^ _ZOBRIST[code, idx],
+                           tt_keys, tt_vals, tt_meta, killers, history, child_static, nodes)
+          cells[idx] = 0
+          if score < value:
+            value = score
+            best_col = col
+          beta = min(beta, value)
+          if beta <= alpha:
+            break
+        heights[col] = row
+        if beta <= alpha:
+          killers[depth] = col
+          history[col] += depth * depth
+          break
+
+    if value <= alpha_orig:
+      flag = TT_UPPER
+    elif value >= beta_orig:
+      flag = TT_LOWER
+    else:
+      flag = TT_EXACT
+    tt_keys[slot] = tt_key
+    tt_vals[slot] = value
+    tt_meta[slot, 0] = depth
+    tt_meta[slot, 1] = flag
+    tt_meta[slot, 2] = best_col
+    return value
+
+  @njit
+  def _search_child(cells, heights, col, depth, n_opp, alpha, key, tt_keys, tt_vals, tt_meta, killers, history,
+                    static, nodes):
+    """Score the bot dropping into `col`, searching `depth` plies below it."""
+    row = heights[col]
+    idx = row * COLS + col
+    child_static = static + _move_delta(cells, idx, True, n_opp + 2)
+    cells[idx] = 1
+    heights[col] = row - 1
+    score = _minimax(cells, heights, depth, False, n_opp, alpha, np.inf, idx, key ^ _ZOBRIST[1, idx],
+                     tt_keys, tt_vals, tt_meta, killers, history, child_static, nodes)
+    cells[idx] = 0
+    heights[col] = row
+    return score
+
+
+class Kernel:
+  """Encoded position plus search tables for one `choose_best_move` call."""
+
+  def __init__(self, cells: bytearray, n_players: int, depth: int):
+    """`cells` is a flat code buffer from `robot_brain.encode_cells`."""
+    self.n_opp = n_players - 1
+    self.cells = np.frombuffer(bytes(cells), dtype=np.int8).copy()
+    filled = np.flatnonzero(self.cells)
+    self.key = int(np.bitwise_xor.reduce(_ZOBRIST[self.cells[filled], filled], initial=0))
+    # Next free row: one above the topmost disc (discs stack from the bottom).
+    self.heights = np.full(COLS, ROWS - 1, dtype=np.int8)
+    for col in range(COLS):
+      column = self.cells[col::COLS]
+      self.heights[col] = np.argmax(column != 0) - 1 if column.any() else ROWS - 1
+    self.tt_keys = np.full(TT_MASK + 1, -1, dtype=np.int64)
+    self.tt_vals = np.zeros(TT_MASK + 1, dtype=np.float64)
+    self.tt_meta = np.zeros((TT_MASK + 1, 3), dtype=np.int64)
+    self.static = _evaluate(self.cells, n_players + 1)
+    self.killers = np.full(depth + 1, -1, dtype=np.int64)
+    self.history = np.zeros(COLS, dtype=np.int64)
+    self.nodes = np.zeros(1, dtype=np.int64)
+
+  def search_child(self, col: int, depth: int, alpha: float) -> float:
+    return _search_child(
+      self.cells, self.heights, col, depth, self.n_opp, alpha, self.key,
+      self.tt_keys, self.tt_vals, self.tt_meta, self.killers, self.history, self.static, self.nodes,
+    )
+
+
+def supports(n_players: int) -> bool:
+  """Whether the kernel can encode a search over `n_players` (plus inert discs)."""
+  return AVAILABLE and n_players + 2 <= MAX_CODES
+
+
+def _warm_up() -> None:
+  """Compile the kernel at import so the first request does not pay for it."""
+  kernel = Kernel(bytearray(ROWS * COLS), 3, 1)
+  kernel.search_child(COLS // 2, 1, -np.inf)
+
+
+if AVAILABLE:
+  _warm_up()
+
+
+__all__ = ["AVAILABLE", "Kernel", "supports"]
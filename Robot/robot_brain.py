@@ -1,15 +1,44 @@
 from __future__ import annotations
 
 import math
+import random
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 ROWS = 10
 COLS = 10
 CONNECT_N = 4
 MAX_DEPTH = 4
 WIN_SCORE = 10_000
+NULL_MOVE_R = 2          # depth reduction for the null-move search
+NULL_MOVE_MIN_DEPTH = 3  # only try a null move with at least this much depth left
+
+
+# Bitboard layout used by the search: column-major, ROWS + 1 bits per column.
+# Bit 0 of a column is its bottom row; the extra top bit is a sentinel that is
+# never set, so shifted lines cannot wrap from one column into the next.
+H1 = ROWS + 1
+BOTTOM_BITS: Tuple[int, ...] = tuple(c * H1 for c in range(COLS))
+TOP_BITS: Tuple[int, ...] = tuple(c * H1 + ROWS for c in range(COLS))
+CENTER_MASK = ((1 << ROWS) - 1) << ((COLS // 2) * H1)
+CENTER_WEIGHT = 2.5
+
+# Center-outward column order: stronger moves first for earlier cutoffs.
+COL_ORDER: Tuple[int, ...] = (5, 4, 6, 3, 7, 2, 8, 1, 9, 0)
+
+# Transposition table: Zobrist key -> (depth, value, flag, best_col).
+TTEntry = Tuple[int, float, int, int]
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+# Zobrist keys per (player slot, bit); rows are added as more slots are seen.
+_ZOBRIST_RNG = random.Random(0x0C04)
+ZOBRIST: List[List[int]] = []
+ZOBRIST_SIDE = _ZOBRIST_RNG.getrandbits(64)  # mixed in when the humans are to move
 
 
 @dataclass
@@ -27,149 +56,556 @@ def choose_best_move(
   bot_id: str = "BOT",
   opponent_ids: Optional[Sequence[str]] = None,
   depth: int = MAX_DEPTH,
+  time_budget_ms: Optional[float] = None,
+  workers: Optional[int] = None,
 ) -> SearchResult:
-  """Compute the bot's move with alpha-beta pruning."""
+  """Compute the bot's move with iteratively deepened alpha-beta pruning.
+
+  Each pass from depth 1 up to `depth` tries the previous best column first
+  and shares one transposition table, so shallow passes seed move ordering
+  for deeper ones. With `time_budget_ms`, deepening stops once the budget
+  is spent and the deepest completed pass is returned.
+
+  With `workers` > 1 the root moves are searched in parallel worker
+  processes instead: one task per (pass, column), queued pass by pass, with
+  a table per process. The budget is one deadline for the whole call; pass 1
+  always runs, and the move comes from the deepest pass every column
+  completed.
+  """
+  opponents = list(opponent_ids) if opponent_ids else infer_opponents(board, bot_id)
+  players = [bot_id] + opponents
+  return _search_cells(encode_cells(board, players), len(players), depth, time_budget_ms, workers)
+
+
+def choose_best_move_cells(
+  cells: bytearray,
+  bot_code: int,
+  opponent_codes: Sequence[int],
+  depth: int = MAX_DEPTH,
+  time_budget_ms: Optional[float] = None,
+  workers: Optional[int] = None,
+) -> SearchResult:
+  """`choose_best_move` for a flat buffer of the caller's own player codes.
+
+  `cells` holds one code per cell at `row * COLS + col` (0 is empty);
+  `bot_code` and `opponent_codes` say which codes are the bot and the
+  humans. Any other nonzero code is a disc outside the search, like an
+  unlisted id in `choose_best_move`. The buffer is remapped to the search's
+  codes with one `bytearray.translate`.
+  """
+  table = bytearray([len(opponent_codes) + 2]) * 256
+  table[0] = 0
+  table[bot_code] = 1
+  for slot, code in enumerate(opponent_codes, start=2):
+    table[code] = slot
+  return _search_cells(cells.translate(table), len(opponent_codes) + 1, depth, time_budget_ms, workers)
+
+
+def _search_cells(
+  cells: bytearray,
+  n_players: int,
+  depth: int = MAX_DEPTH,
+  time_budget_ms: Optional[float] = None,
+  workers: Optional[int] = None,
+) -> SearchResult:
+  """`choose_best_move` for a code buffer from `encode_cells` over `n_players` players."""
   start = time.perf_counter()
-  nodes = [0]
+  deadline = None if time_budget_ms is None else start + time_budget_ms / 1000.0
+  _, heights = cells_to_bitboards(cells, n_players)
 
-  opponents = list(opponent_ids) if opponent_ids else infer_opponents(board, bot_id)
-  valid_columns = [c for c in range(COLS) if find_drop_row(board, c) is not None]
+  valid_columns = [c for c in COL_ORDER if heights[c] < TOP_BITS[c]]
   if not valid_columns:
     raise ValueError("Board is full; no moves available.")
 
+  best_col: Optional[int] = None
   best_score = -math.inf
-  best_move: Optional[Tuple[int, int]] = None
+  completed = 0
+  nodes = 0
+
+  if workers is not None and workers > 1 and len(valid_columns) > 1:
+    # Wall-clock time, so every worker process checks the same deadline.
+    wall_deadline = None if time_budget_ms is None else time.time() + time_budget_ms / 1000.0
+    passes: Dict[int, Dict[int, float]] = {}
+    try:
+      pool = _root_pool(workers)
+      # One task per (pass, column), queued pass by pass like the serial loop.
+      tasks = [
+        (iteration_depth, col, pool.submit(
+          _search_root_move, bytes(cells), n_players, depth, col, iteration_depth, wall_deadline,
+        ))
+        for iteration_depth in range(1, depth + 1)
+        for col in valid_columns
+      ]
+      for iteration_depth, col, future in tasks:
+        result = future.result()
+        if result is not None:
+          passes.setdefault(iteration_depth, {})[col] = result[0]
+          nodes += result[1]
+    except BrokenProcessPool:
+      # A worker died and took the pool with it: start a fresh pool next call
+      # and let the serial search below answer this one.
+      _drop_root_pool()
+      passes.clear()
+      nodes = 0
+
+    if passes:
+      # Pass 1 always runs, so some pass has a score for every column.
+      completed = max(d for d, scores in passes.items() if len(scores) == len(valid_columns))
+      for col in valid_columns:
+        if passes[completed][col] > best_score:
+          best_score = passes[completed][col]
+          best_col = col
+
+  if best_col is None:
+    searcher = RootSearcher(cells, n_players, depth)
+    for iteration_depth in range(1, depth + 1):
+      iteration_best: Optional[int] = None
+      iteration_score = -math.inf
+      timed_out = False
+
+      for col in with_first(valid_columns, best_col):
+        if deadline is not None and completed and time.perf_counter() >= deadline:
+          timed_out = True
+          break
+
+        score = searcher.search_child(col, iteration_depth - 1, iteration_score)
+        if score > iteration_score:
+          iteration_score = score
+          iteration_best = col
+
+      if timed_out:
+        break
+      best_col, best_score, completed = iteration_best, iteration_score, iteration_depth
+      if deadline is not None and time.perf_counter() >= deadline:
+        break
+    nodes += searcher.node_count()
 
-  for col in valid_columns:
-    drop_row = find_drop_row(board, col)
-    assert drop_row is not None
-    child_board = place_disc(board, drop_row, col, bot_id)
+  decision_ms = (time.perf_counter() - start) * 1000.0
+  if best_col is None:
+    raise RuntimeError("Failed to select a move despite available columns.")
+
+  return SearchResult(
+    column=best_col,
+    row=bit_cell(heights[best_col])[0],
+    score=best_score,
+    depth=completed,
+    nodes=nodes,
+    decision_ms=decision_ms,
+  )
+
+
+class RootSearcher:
+  """Position and search tables shared by every root move of one search."""
+
+  def __init__(self, cells: bytearray, n_players: int, depth: int):
+    self.boards, self.heights = cells_to_bitboards(cells, n_players)
+    self.opp_slots = range(1, n_players)
+    self.key = zobrist_hash(self.boards)
+    self.static = evaluate_bits(self.boards)  # updated per move via move_delta from here on
+    self.tt: Dict[int, TTEntry] = {}
+    # Move-ordering state: killer column per remaining depth, cutoff history per column.
+    self.killers: List[Optional[int]] = [None] * (depth + 1)
+    self.history = [0] * COLS
+    self.nodes = [0]
+    # Compiled subtree search when numba is installed; same results, native speed.
+    self.kernel = _brain_numba.Kernel(cells, n_players, depth) if _brain_numba.supports(n_players) else None
+
+  def search_child(self, col: int, depth: int, alpha: float) -> float:
+    """Score the bot dropping into `col`, searching `depth` plies below it."""
+    if self.kernel is not None:
+      return self.kernel.search_child(col, depth, alpha)
+
+    boards, heights = self.boards, self.heights
+    bit = heights[col]
+    child_static = self.static + move_delta(boards, bit, True)
+    boards[0] ^= 1 << bit
+    heights[col] = bit + 1
 
     score = minimax(
-      board=child_board,
-      depth=depth - 1,
+      boards=boards,
+      heights=heights,
+      depth=depth,
       maximizing=False,
-      bot_id=bot_id,
-      opponents=opponents,
-      alpha=-math.inf,
+      opp_slots=self.opp_slots,
+      alpha=alpha,
       beta=math.inf,
-      last_move=(drop_row, col),
-      nodes=nodes,
+      last_slot=0,
+      nodes=self.nodes,
+      key=self.key ^ ZOBRIST[0][bit],
+      tt=self.tt,
+      killers=self.killers,
+      history=self.history,
+      static=child_static,
     )
 
-    if score > best_score:
-      best_score = score
-      best_move = (drop_row, col)
+    boards[0] ^= 1 << bit
+    heights[col] = bit
+    return score
 
-  decision_ms = (time.perf_counter() - start) * 1000.0
-  if best_move is None:
-    raise RuntimeError("Failed to select a move despite available columns.")
+  def node_count(self) -> int:
+    return self.nodes[0] + (int(self.kernel.nodes[0]) if self.kernel is not None else 0)
 
-  return SearchResult(
-    column=best_move[1],
-    row=best_move[0],
-    score=best_score,
-    depth=depth,
-    nodes=nodes[0],
-    decision_ms=decision_ms,
-  )
+
+def _search_root_move(
+  cells: bytes,
+  n_players: int,
+  max_depth: int,
+  col: int,
+  depth: int,
+  deadline: Optional[float],
+) -> Optional[Tuple[float, int]]:
+  """Worker task: the pass-`depth` score of the bot's move into `col`.
+
+  Returns the score and the nodes it took, or None for a pass after the first
+  dequeued once `deadline` (a `time.time()` value) has passed. Each worker
+  process keeps one RootSearcher per position, so later passes reuse the
+  table and move ordering built by earlier ones.
+  """
+  global _WORKER_SEARCH
+  if depth > 1 and deadline is not None and time.time() >= deadline:
+    return None
+  position = (cells, n_players, max_depth)
+  if _WORKER_SEARCH is None or _WORKER_SEARCH[0] != position:
+    _WORKER_SEARCH = (position, RootSearcher(bytearray(cells), n_players, max_depth))
+  searcher = _WORKER_SEARCH[1]
+  nodes = searcher.node_count()
+  score = searcher.search_child(col, depth - 1, -math.inf)
+  return score, searcher.node_count() - nodes
+
+
+# Searcher for the position a worker process last saw, keyed by
+# (cells, n_players, max_depth); only set inside pool workers.
+_WORKER_SEARCH: Optional[Tuple[Tuple[bytes, int, int], RootSearcher]] = None
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+
+
+def _root_pool(workers: int) -> ProcessPoolExecutor:
+  """Process pool for root-parallel searches, kept alive between calls."""
+  global _POOL, _POOL_WORKERS
+  if _POOL is None or _POOL_WORKERS != workers:
+    if _POOL is not None:
+      _POOL.shutdown(wait=False)
+    _POOL = ProcessPoolExecutor(max_workers=workers)
+    _POOL_WORKERS = workers
+  return _POOL
+
+
+def _drop_root_pool() -> None:
+  """Forget the pool (e.g. once broken) so the next call starts a new one."""
+  global _POOL, _POOL_WORKERS
+  if _POOL is not None:
+    _POOL.shutdown(wait=False)
+  _POOL, _POOL_WORKERS = None, 0
 
 
 def minimax(
-  board: List[List[Optional[str]]],
+  boards: List[int],
+  heights: List[int],
   depth: int,
   maximizing: bool,
-  bot_id: str,
-  opponents: Sequence[str],
+  opp_slots: Sequence[int],
   alpha: float,
   beta: float,
-  last_move: Optional[Tuple[int, int]],
+  last_slot: Optional[int],
   nodes: List[int],
+  key: int,
+  tt: Dict[int, TTEntry],
+  killers: List[Optional[int]],
+  history: List[int],
+  static: float,
 ) -> float:
-  """Alpha-beta search; returns a heuristic score from the bot's perspective."""
+  """Alpha-beta search over bitboards; slot 0 is the bot, `opp_slots` the humans.
+
+  Moves are made and undone in place on `boards`/`heights`, so both are
+  unchanged when this returns. `key` is the Zobrist hash of `boards`, kept
+  in step with every move; results are cached in `tt` under it. Moves are
+  ordered by `order_moves`; a column causing a cutoff becomes the killer for
+  this depth and earns `depth * depth` history. `static` is
+  `evaluate_bits(boards)`, maintained incrementally with `move_delta`.
+  Returns a heuristic score from the bot's perspective.
+  """
   nodes[0] += 1
 
-  if last_move is not None:
-    if check_win(board, last_move[0], last_move[1], connect_n=CONNECT_N):
-      winner = board[last_move[0]][last_move[1]]
-      if winner == bot_id:
-        return WIN_SCORE + depth  # prefer faster wins
-      return -WIN_SCORE - depth   # prefer slower losses
-
-  if depth == 0 or board_is_full(board):
-    return evaluate_board(board, bot_id=bot_id, opponents=opponents)
+  if last_slot is not None and has_four(boards[last_slot]):
+    if last_slot == 0:
+      return WIN_SCORE + depth  # prefer faster wins
+    return -WIN_SCORE - depth   # prefer slower losses
+
+  valid_columns = [c for c in COL_ORDER if heights[c] < TOP_BITS[c]]
+  if depth == 0 or not valid_columns:
+    return static
+
+  tt_key = key if maximizing else key ^ ZOBRIST_SIDE
+  entry = tt.get(tt_key)
+  if entry is not None and entry[0] >= depth:
+    _, stored, flag, _ = entry
+    if flag == TT_EXACT:
+      return stored
+    if flag == TT_LOWER:
+      alpha = max(alpha, stored)
+    else:
+      beta = min(beta, stored)
+    if alpha >= beta:
+      return stored
+
+  # Null move: let the humans move again. If the bot still reaches beta after
+  # passing, a real move would too. Skipped near open threes, where passing
+  # can look better than any real move (zugzwang).
+  if maximizing and depth >= NULL_MOVE_MIN_DEPTH and beta < math.inf and not has_open_three(boards):
+    null_score = minimax(
+      boards, heights, depth - 1 - NULL_MOVE_R, False, opp_slots, beta - 1, beta, None, nodes,
+      key, tt, killers, history, static,
+    )
+    if null_score >= beta:
+      return null_score
 
-  valid_columns = [c for c in range(COLS) if find_drop_row(board, c) is not None]
-  if not valid_columns:
-    return evaluate_board(board, bot_id=bot_id, opponents=opponents)
+  valid_columns = order_moves(valid_columns, entry[3] if entry is not None else None, killers[depth], history)
+  alpha_orig, beta_orig = alpha, beta
+  best_col = valid_columns[0]
 
   if maximizing:
     value = -math.inf
     for col in valid_columns:
-      row = find_drop_row(board, col)
-      assert row is not None
-      child_board = place_disc(board, row, col, bot_id)
-      score = minimax(child_board, depth - 1, False, bot_id, opponents, alpha, beta, (row, col), nodes)
-      value = max(value, score)
+      bit = heights[col]
+      child_static = static + move_delta(boards, bit, True)
+      boards[0] ^= 1 << bit
+      heights[col] = bit + 1
+      score = minimax(
+        boards, heights, depth - 1, False, opp_slots, alpha, beta, 0, nodes,
+        key ^ ZOBRIST[0][bit], tt, killers, history, child_static,
+      )
+      boards[0] ^= 1 << bit
+      heights[col] = bit
+      if score > value:
+        value = score
+        best_col = col
       alpha = max(alpha, value)
       if alpha >= beta:
+        killers[depth] = col
+        history[col] += depth * depth
         break
-    return value
-
-  # Minimizing layer: explore every human id and take the worst outcome for the bot.
-  value = math.inf
-  for col in valid_columns:
-    row = find_drop_row(board, col)
-    assert row is not None
-    for opp in opponents:
-      child_board = place_disc(board, row, col, opp)
-      score = minimax(child_board, depth - 1, True, bot_id, opponents, alpha, beta, (row, col), nodes)
-      if score < value:
-        value = score
-      beta = min(beta, value)
+  else:
+    # Minimizing layer: explore every human id and take the worst outcome for the bot.
+    value = math.inf
+    for col in valid_columns:
+      bit = heights[col]
+      child_static = static + move_delta(boards, bit, False)  # same for every human
+      heights[col] = bit + 1
+      for slot in opp_slots:
+        boards[slot] ^= 1 << bit
+        score = minimax(
+          boards, heights, depth - 1, True, opp_slots, alpha, beta, slot, nodes,
+          key ^ ZOBRIST[slot][bit], tt, killers, history, child_static,
+        )
+        boards[slot] ^= 1 << bit
+        if score < value:
+          value = score
+          best_col = col
+        beta = min(beta, value)
+        if beta <= alpha:
+          break
+      heights[col] = bit
       if beta <= alpha:
+        killers[depth] = col
+        history[col] += depth * depth
         break
-    if beta <= alpha:
-      break
+
+  if value <= alpha_orig:
+    flag = TT_UPPER
+  elif value >= beta_orig:
+    flag = TT_LOWER
+  else:
+    flag = TT_EXACT
+  tt[tt_key] = (depth, value, flag, best_col)
   return value
 
 
+def with_first(columns: List[int], first: Optional[int]) -> List[int]:
+  """Return `columns` with `first` moved to the front when it is present."""
+  if first is None or not columns or columns[0] == first or first not in columns:
+    return columns
+  return [first] + [c for c in columns if c != first]
+
+
+def move_delta(boards: List[int], bit: int, is_bot: bool) -> float:
+  """Change in `evaluate_bits(boards)` once `bit` takes a bot (or opponent) disc.
+
+  Only the windows through `bit` (CELL_WINDOWS) and the center column change.
+  """
+  bot = boards[0]
+  opp = 0
+  for bb in boards[1:-1]:
+    opp |= bb
+  other = boards[-1]
+
+  stride = CONNECT_N + 1
+  step = stride if is_bot else 1
+  delta = CENTER_WEIGHT if is_bot and (CENTER_MASK >> bit) & 1 else 0.0
+  for mask in CELL_WINDOWS[bit]:
+    if other & mask:
+      continue  # scores 0 before and after
+    idx = (bot & mask).bit_count() * stride + (opp & mask).bit_count()
+    delta += _WINDOW_TABLE[idx + step] - _WINDOW_TABLE[idx]
+  return delta
+
+
+def has_open_three(boards: List[int]) -> bool:
+  """Whether some window holds three discs of one side and one empty cell."""
+  bot = boards[0]
+  opp = 0
+  for bb in boards[1:-1]:
+    opp |= bb
+  other = boards[-1]
+  for mask in WINDOW_MASKS:
+    if other & mask:
+      continue
+    bot_count = (bot & mask).bit_count()
+    opp_count = (opp & mask).bit_count()
+    if bot_count + opp_count == CONNECT_N - 1 and (bot_count == 0 or opp_count == 0):
+      return True
+  return False
+
+
+def order_moves(
+  columns: List[int],
+  tt_col: Optional[int],
+  killer: Optional[int],
+  history: List[int],
+) -> List[int]:
+  """Cached best column, then the killer, then the rest by descending history.
+
+  The sort is stable, so columns with equal history keep their `columns` order.
+  """
+  front: List[int] = []
+  for c in (tt_col, killer):
+    if c is not None and c in columns and c not in front:
+      front.append(c)
+  rest = [c for c in columns if c not in front]
+  rest.sort(key=lambda c: -history[c])
+  return front + rest
+
+
+def encode_cells(board: List[List[Optional[str]]], players: Sequence[str]) -> bytearray:
+  """Flatten the grid to integer codes at `row * COLS + col`.
+
+  0 is empty, `i + 1` is `players[i]` and `len(players) + 1` is anyone else.
+  This is the only place the search compares player id strings.
+  """
+  codes: Dict[Optional[str], int] = {pid: i + 1 for i, pid in enumerate(players)}
+  codes[None] = 0
+  other = len(players) + 1
+  return bytearray(codes.get(cell, other) for row in board for cell in row)
+
+
+def encode_board(board: List[List[Optional[str]]], players: Sequence[str]) -> Tuple[List[int], List[int]]:
+  """Pack the grid into one bitboard per entry of `players` plus column heights.
+
+  `heights[c]` is the bit index of the next free cell in column c. Discs owned
+  by ids outside `players` go to one extra trailing board that never moves;
+  windows touching it score 0 during evaluation.
+  """
+  return cells_to_bitboards(encode_cells(board, players), len(players))
+
+
+def cells_to_bitboards(cells: bytearray, n_players: int) -> Tuple[List[int], List[int]]:
+  """`encode_board` for a flat code buffer from `encode_cells`."""
+  boards = [0] * (n_players + 1)
+  heights = list(BOTTOM_BITS)
+  for col in range(COLS):
+    for idx in range((ROWS - 1) * COLS + col, -1, -COLS):
+      code = cells[idx]
+      if not code:
+        break
+      boards[code - 1] |= 1 << heights[col]
+      heights[col] += 1
+  return boards, heights
+
+
+def zobrist_hash(boards: List[int]) -> int:
+  """Zobrist key of a bitboard position (side to move not included)."""
+  while len(ZOBRIST) < len(boards):
+    ZOBRIST.append([_ZOBRIST_RNG.getrandbits(64) for _ in range(COLS * H1)])
+  key = 0
+  for slot, bb in enumerate(boards):
+    while bb:
+      low = bb & -bb
+      key ^= ZOBRIST[slot][low.bit_length() - 1]
+      bb ^= low
+  return key
+
+
+def bit_cell(bit: int) -> Tuple[int, int]:
+  """Map a bitboard index back to its (row, col) grid cell."""
+  col, offset = divmod(bit, H1)
+  return ROWS - 1 - offset, col
+
+
+def cell_bit(row: int, col: int) -> int:
+  return col * H1 + (ROWS - 1 - row)
+
+
+def has_four(bb: int) -> bool:
+  """Shift-AND test for four in a row: vertical, horizontal and both diagonals."""
+  for shift in (1, H1, ROWS, H1 + 1):
+    m = bb & (bb >> shift)
+    if m & (m >> (2 * shift)):
+      return True
+  return False
+
+
+def evaluate_bits(boards: List[int]) -> float:
+  """Bitboard counterpart of `evaluate_board`.
+
+  The trailing board holds discs of ids outside the search; like
+  `score_window`, any window containing one of them scores 0.
+  """
+  bot = boards[0]
+  opp = 0
+  for bb in boards[1:-1]:
+    opp |= bb
+  other = boards[-1]
+
+  score = (bot & CENTER_MASK).bit_count() * CENTER_WEIGHT
+  for mask in WINDOW_MASKS:
+    if other & mask:
+      continue
+    score += _WINDOW_TABLE[(bot & mask).bit_count() * (CONNECT_N + 1) + (opp & mask).bit_count()]
+  return score
+
+
 def evaluate_board(board: List[List[Optional[str]]], bot_id: str, opponents: Sequence[str]) -> float:
   """Static evaluation: positive is good for the bot."""
   score = 0.0
 
   center_col = COLS // 2
-  center_weight = 2.5
   center_count = sum(1 for r in range(ROWS) if board[r][center_col] == bot_id)
-  score += center_count * center_weight
-
-  # Scan all possible windows of length CONNECT_N.
-  directions = [
-    (0, 1),   # horizontal
-    (1, 0),   # vertical
-    (1, 1),   # diag down-right
-    (-1, 1),  # diag up-right
-  ]
+  score += center_count * CENTER_WEIGHT
 
-  for row in range(ROWS):
-    for col in range(COLS):
-      for dr, dc in directions:
-        if not in_bounds(row + (CONNECT_N - 1) * dr, col + (CONNECT_N - 1) * dc):
-          continue
-        window = [
-          board[row + k * dr][col + k * dc]
-          for k in range(CONNECT_N)
-        ]
-        score += score_window(window, bot_id, opponents)
+  # Scan all possible windows of length CONNECT_N (precomputed, see WINDOW_CELLS).
+  for r0, c0, r1, c1, r2, c2, r3, c3 in WINDOW_CELLS:
+    window = (board[r0][c0], board[r1][c1], board[r2][c2], board[r3][c3])
+    score += score_window(window, bot_id, opponents)
 
   return score
 
 
 def score_window(window: Sequence[Optional[str]], bot_id: str, opponents: Sequence[str]) -> float:
-  bot_count = sum(1 for cell in window if cell == bot_id)
-  opp_count = sum(1 for cell in window if cell in opponents)
-  empty_count = window.count(None)
-
+  bot_count = opp_count = empty_count = 0
+  for cell in window:
+    if cell is None:
+      empty_count += 1
+    elif cell == bot_id:
+      bot_count += 1
+    elif cell in opponents:
+      opp_count += 1
+  if bot_count + opp_count + empty_count == CONNECT_N:
+    # No foreign ids, so the counts alone index the precomputed scores.
+    return _WINDOW_TABLE[bot_count * (CONNECT_N + 1) + opp_count]
+  return score_counts(bot_count, opp_count, empty_count)
+
+
+def score_counts(bot_count: int, opp_count: int, empty_count: int) -> float:
   if bot_count > 0 and opp_count > 0:
     return 0.0  # contested window
   if bot_count == CONNECT_N:
@@ -214,17 +650,6 @@ def find_drop_row(board: List[List[Optional[str]]], col: int) -> Optional[int]:
   return None
 
 
-def board_is_full(board: List[List[Optional[str]]]) -> bool:
-  return all(board[0][c] is not None for c in range(COLS))
-
-
-def place_disc(board: List[List[Optional[str]]], row: int, col: int, player: str) -> List[List[Optional[str]]]:
-  """Copy the board and place a disc at (row, col)."""
-  copy = [list(r) for r in board]
-  copy[row][col] = player
-  return copy
-
-
 def in_bounds(row: int, col: int) -> bool:
   return 0 <= row < ROWS and 0 <= col < COLS
 
@@ -261,11 +686,80 @@ def check_win(board: List[List[Optional[str]]], row: int, col: int, connect_n: i
   return False
 
 
+def check_win_cells(cells: Sequence[int], row: int, col: int, connect_n: int = CONNECT_N) -> bool:
+  """`check_win` for a flat buffer of integer codes at `row * COLS + col` (0 is empty)."""
+  idx = row * COLS + col
+  code = cells[idx]
+  if not code:
+    return False
+
+  for dr, dc in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+    step = dr * COLS + dc
+    count = 1
+    # Forward
+    r, c, i = row + dr, col + dc, idx + step
+    while in_bounds(r, c) and cells[i] == code:
+      count += 1
+      r, c, i = r + dr, c + dc, i + step
+    # Backward
+    r, c, i = row - dr, col - dc, idx - step
+    while in_bounds(r, c) and cells[i] == code:
+      count += 1
+      r, c, i = r - dr, c - dc, i - step
+    if count >= connect_n:
+      return True
+  return False
+
+
+# Every CONNECT_N-cell window as flat (r0, c0, r1, c1, ...) coordinates, built
+# once here instead of re-deriving (and bounds-checking) them on every call.
+WINDOW_CELLS: List[Tuple[int, ...]] = [
+  tuple(v for k in range(CONNECT_N) for v in (row + k * dr, col + k * dc))
+  for row in range(ROWS)
+  for col in range(COLS)
+  for dr, dc in (
+    (0, 1),   # horizontal
+    (1, 0),   # vertical
+    (1, 1),   # diag down-right
+    (-1, 1),  # diag up-right
+  )
+  if in_bounds(row + (CONNECT_N - 1) * dr, col + (CONNECT_N - 1) * dc)
+]
+
+# The same windows as bitboard masks, for the search.
+WINDOW_MASKS: List[int] = [
+  sum(1 << cell_bit(cells[i], cells[i + 1]) for i in range(0, len(cells), 2))
+  for cells in WINDOW_CELLS
+]
+
+# The WINDOW_MASKS covering each bit (at most 16; empty for sentinels).
+CELL_WINDOWS: List[List[int]] = [
+  [mask for mask in WINDOW_MASKS if (mask >> bit) & 1]
+  for bit in range(COLS * H1)
+]
+
+# score_counts for every (bot_count, opp_count) pair, at bot_count * (CONNECT_N + 1) + opp_count.
+_WINDOW_TABLE: List[float] = [
+  score_counts(bot_count, opp_count, CONNECT_N - bot_count - opp_count)
+  if bot_count + opp_count <= CONNECT_N else 0.0
+  for bot_count in range(CONNECT_N + 1)
+  for opp_count in range(CONNECT_N + 1)
+]
+
+
 __all__ = [
   "SearchResult",
   "choose_best_move",
+  "choose_best_move_cells",
+  "encode_board",
+  "encode_cells",
   "find_drop_row",
   "check_win",
+  "check_win_cells",
   "evaluate_board",
   "infer_opponents",
 ]
+
+
+# Imported last: the kernel module reads the constants defined above.
+from . import _brain_numba  # noqa: E402
@@ -0,0 +1,22 @@
+"""
+Optional ahead-of-time build of the bot search (package metadata lives in
+pyproject.toml).
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+compiles Robot/robot_brain.py with mypyc into a native extension next to the
+source. Python imports the extension in preference to the .py file, so nothing
+else changes; delete the generated robot_brain*.so files to go back to pure
+Python. Without mypy installed this builds nothing.
+"""
+from setuptools import setup
+
+try:
+  from mypyc.build import mypycify
+except ImportError:
+  ext_modules = []
+else:
+  ext_modules = mypycify(["Robot/robot_brain.py"], opt_level="3")
+
+setup(ext_modules=ext_modules)
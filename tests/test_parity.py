@@ -0,0 +1,167 @@
+"""
+Parity between the search implementations: the pure-Python bitboard search,
+the Numba kernel (when numba is installed) and the mypyc build of
+robot_brain (when compiled). All must pick the same column with the same
+score, and the bitboard evaluation must match the grid one. Node counts are
+compared only at DEPTH: deeper, the kernel's fixed-size table overwrites
+entries the Python dict keeps, so the kernel may search a few more or fewer
+nodes.
+
+    python -m unittest discover tests
+"""
+from __future__ import annotations
+
+import functools
+import importlib.util
+import random
+import sys
+import unittest
+from pathlib import Path
+from typing import List, Optional
+from unittest import mock
+
+from Robot import _brain_numba, robot_brain
+from Robot.robot_brain import COLS, ROWS
+
+BOT = "BOT"
+HUMANS = ["P1", "P2"]
+DEPTH = 4  # shallow enough for node counts to agree across builds
+DEEP_DEPTH = 6  # deep enough for null moves (NULL_MOVE_MIN_DEPTH at a maximizing node)
+
+Board = List[List[Optional[str]]]
+
+
+def random_board(seed: int, moves: int) -> Board:
+  """Random legal position without a finished line."""
+  rnd = random.Random(seed)
+  board: Board = [[None] * COLS for _ in range(ROWS)]
+  for _ in range(moves):
+    col = rnd.choice([c for c in range(COLS) if board[0][c] is None])
+    row = robot_brain.find_drop_row(board, col)
+    assert row is not None
+    board[row][col] = rnd.choice(HUMANS + [BOT])
+    if robot_brain.check_win(board, row, col):
+      board[row][col] = None
+      break
+  return board
+
+
+def foreign_board() -> Board:
+  """P2 is on the board but left out of the search's opponents."""
+  board: Board = [[None] * COLS for _ in range(ROWS)]
+  for col in range(3):
+    board[ROWS - 1][col] = "P2"
+  board[ROWS - 1][5] = "P1"
+  return board
+
+
+POSITIONS = [(random_board(seed, seed * 3), HUMANS) for seed in range(10)]
+POSITIONS.append((foreign_board(), ["P1"]))
+
+
+def search(module, board: Board, opponents: List[str], depth: int = DEPTH):
+  result = module.choose_best_move([row[:] for row in board], BOT, opponents, depth=depth)
+  return result.column, result.score, result.nodes
+
+
+def bottom_row(*cells: Optional[str]) -> Board:
+  board: Board = [[None] * COLS for _ in range(ROWS)]
+  board[ROWS - 1][:len(cells)] = cells
+  return board
+
+
+COMPILED = not robot_brain.__file__.endswith(".py")
+
+
+@functools.lru_cache(maxsize=None)
+def python_source():
+  """robot_brain.py as plain Python, loaded beside the extension when compiled."""
+  if not COMPILED:
+    return robot_brain
+  path = Path(robot_brain.__file__).with_name("robot_brain.py")
+  spec = importlib.util.spec_from_file_location("Robot._robot_brain_source", path)
+  assert spec is not None and spec.loader is not None
+  source = importlib.util.module_from_spec(spec)
+  sys.modules[spec.name] = source
+  spec.loader.exec_module(source)
+  return source
+
+
+def pure_python():
+  """Keep searches inside the block off the Numba kernel."""
+  return mock.patch.object(_brain_numba, "supports", lambda n_players: False)
+
+
+class EvaluationParityTest(unittest.TestCase):
+  def test_bitboards_match_grid(self):
+    for board, opponents in POSITIONS:
+      boards, _ = robot_brain.encode_board(board, [BOT] + opponents)
+      self.assertEqual(
+        robot_brain.evaluate_bits(boards),
+        robot_brain.evaluate_board(board, BOT, opponents),
+      )
+
+  @unittest.skipUnless(_brain_numba.AVAILABLE, "numba not installed")
+  def test_kernel_matches_grid(self):
+    for board, opponents in POSITIONS:
+      players = [BOT] + opponents
+      kernel = _brain_numba.Kernel(robot_brain.encode_cells(board, players), len(players), 1)
+      self.assertEqual(kernel.static, robot_brain.evaluate_board(board, BOT, opponents))
+
+
+class OpenThreeTest(unittest.TestCase):
+  CASES = [
+    (bottom_row(BOT, BOT, BOT), True),
+    (bottom_row("P1", "P1", "P1"), True),
+    (bottom_row(BOT, BOT, "P1"), False),
+    (bottom_row(BOT, BOT, BOT, "P2"), False),  # P2 is outside the search
+  ]
+
+  def test_bitboards(self):
+    for board, expected in self.CASES:
+      boards, _ = robot_brain.encode_board(board, [BOT, "P1"])
+      self.assertEqual(robot_brain.has_open_three(boards), expected)
+
+  @unittest.skipUnless(_brain_numba.AVAILABLE, "numba not installed")
+  def test_kernel(self):
+    for board, expected in self.CASES:
+      kernel = _brain_numba.Kernel(robot_brain.encode_cells(board, [BOT, "P1"]), 2, 1)
+      self.assertEqual(_brain_numba._has_open_three(kernel.cells, kernel.n_opp + 2), expected)
+
+
+class SearchParityTest(unittest.TestCase):
+  @unittest.skipUnless(_brain_numba.AVAILABLE, "numba not installed")
+  def test_kernel_matches_pure_python(self):
+    for board, opponents in POSITIONS:
+      with pure_python():
+        expected = search(robot_brain, board, opponents)
+      self.assertEqual(search(robot_brain, board, opponents), expected)
+
+  @unittest.skipUnless(_brain_numba.AVAILABLE, "numba not installed")
+  def test_kernel_matches_pure_python_deep(self):
+    # Spy in the plain-Python module: a compiled one calls its helpers directly.
+    source = python_source()
+    with pure_python(), mock.patch.object(source, "has_open_three", wraps=source.has_open_three) as open_three:
+      expected = [search(source, board, opponents, DEEP_DEPTH)[:2] for board, opponents in POSITIONS]
+    self.assertTrue(open_three.called, "no null move was tried")
+    for (board, opponents), column_score in zip(POSITIONS, expected):
+      self.assertEqual(search(robot_brain, board, opponents, DEEP_DEPTH)[:2], column_score)
+
+  def test_cells_entry_point_matches_grid(self):
+    ids = [None, "P1", "P2", BOT]  # the backend's code table
+    for board, opponents in POSITIONS:
+      flat = bytearray(ids.index(cell) for row in board for cell in row)
+      result = robot_brain.choose_best_move_cells(
+        flat, ids.index(BOT), [ids.index(p) for p in opponents], depth=DEPTH,
+      )
+      self.assertEqual((result.column, result.score, result.nodes), search(robot_brain, board, opponents))
+
+  @unittest.skipUnless(COMPILED, "robot_brain is not compiled")
+  def test_mypyc_matches_source(self):
+    source = python_source()
+    with pure_python():
+      for board, opponents in POSITIONS:
+        self.assertEqual(search(robot_brain, board, opponents), search(source, board, opponents))
+
+if __name__ == "__main__":
+  unittest.main()